@@ -85,24 +85,24 @@ def poisson_gene_selection(
         If batch_key is given, this denotes in how many batches genes are detected as zero enriched
 
     """
-    data = adata.layers[layer] if layer is not None else adata.X
-    if _check_nonnegative_integers(data) is False:
+    X = adata.layers[layer] if layer is not None else adata.X
+    if _check_nonnegative_integers(X) is False:
         raise ValueError("`poisson_gene_selection` expects " "raw count data.")
 
     use_gpu = use_gpu and torch.cuda.is_available()
 
     if batch_key is None:
-        batch_info = pd.Categorical(np.zeros(adata.shape[0], dtype=int))
+        batch_info = np.zeros(adata.shape[0], dtype=int)
     else:
-        batch_info = adata.obs[batch_key]
+        batch_info = adata.obs[batch_key].to_numpy()
 
     prob_zero_enrichments = []
     obs_frac_zeross = []
     exp_frac_zeross = []
     for b in np.unique(batch_info):
 
-        ad = adata[batch_info == b]
-        data = ad.layers[layer] if layer is not None else ad.X
+        # index the matrix directly rather than building an AnnData view
+        data = X[np.where(batch_info == b)[0]]
 
         # Calculate empirical statistics.
         sum_0 = np.asarray(data.sum(0)).ravel()
@@ -203,18 +203,25 @@ def _check_nonnegative_integers(
     else:
         raise TypeError("data type not understood")
 
-    inds = np.random.choice(len(data), size=(n_to_check,))
-    check = jax.device_put(data.flat[inds], device=jax.devices("cpu")[0])
-    negative, non_integer = _is_not_count_val(check)
-    return not (negative or non_integer)
+    # sparse data with no stored values is all zeros
+    if data.size == 0:
+        return True
+
+    inds = np.random.choice(data.size, size=(n_to_check,))
+    sample = data.flat[inds]
+
+    # integer dtypes only need to be checked for negative values
+    if np.issubdtype(sample.dtype, np.integer):
+        return bool(sample.min() >= 0)
+
+    check = jax.device_put(sample, device=jax.devices("cpu")[0])
+    return not _is_not_count_val(check)
 
 
 @jax.jit
 def _is_not_count_val(data: jnp.ndarray):
-    negative = jnp.any(data < 0)
-    non_integer = jnp.any(data % 1 != 0)
-
-    return negative, non_integer
+    # single fused pass checking for negative, non-integer or non-finite values
+    return jnp.any((data < 0) | (data != jnp.floor(data)) | ~jnp.isfinite(data))
 
 
 def _get_batch_mask_protein_data(
@@ -230,8 +237,12 @@ def _get_batch_mask_protein_data(
     pro_exp = pro_exp.to_numpy() if isinstance(pro_exp, pd.DataFrame) else pro_exp
     batches = adata.obs[batch_key].values
     batch_mask = {}
-    for b in np.unique(batches):
-        b_inds = np.where(batches.ravel() == b)[0]
+    # group cell indices by batch with a single sort, on plain values so that
+    # categorical columns are not sorted by category code
+    batches = np.asarray(batches).ravel()
+    order = np.argsort(batches, kind="stable")
+    uniq_batches, starts = np.unique(batches[order], return_index=True)
+    for b, b_inds in zip(uniq_batches, np.split(order, starts[1:])):
         batch_sum = pro_exp[b_inds, :].sum(axis=0)
         all_zero = batch_sum == 0
         batch_mask[b] = ~all_zero
@@ -62,8 +62,11 @@ class ProteinFieldMixin:
         pro_exp = pro_exp.to_numpy() if isinstance(pro_exp, pd.DataFrame) else pro_exp
         batches = self.batch_field.get_field_data(adata)
         batch_mask = {}
-        for b in np.unique(batches):
-            b_inds = np.where(batches.ravel() == b)[0]
+        # group cell indices by batch with a single sort
+        batches = batches.ravel()
+        order = np.argsort(batches, kind="stable")
+        uniq_batches, starts = np.unique(batches[order], return_index=True)
+        for b, b_inds in zip(uniq_batches, np.split(order, starts[1:])):
             batch_sum = pro_exp[b_inds, :].sum(axis=0)
             all_zero = batch_sum == 0
             batch_mask[b] = ~all_zero
@@ -1101,12 +1101,13 @@ class TOTALVI(RNASeqMixin, VAEMixin, ArchesMixin, BaseModelClass):
             for b in np.unique(codes):
                 # can happen during online updates
                 # the values of these batches will not be used
-                num_in_batch = np.sum(batch == b)
+                idx_batch = batch == b
+                num_in_batch = np.sum(idx_batch)
                 if num_in_batch == 0:
                     batch_avg_mus.append(0)
                     batch_avg_scales.append(1)
                     continue
-                batch_pro_exp = pro_exp[batch == b]
+                batch_pro_exp = pro_exp[idx_batch]
 
                 # non missing
                 if batch_mask is not None:
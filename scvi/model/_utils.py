@@ -3,9 +3,11 @@ import warnings
 from collections.abc import Iterable as IterableClass
 from typing import Dict, List, Optional, Sequence, Tuple, Union
 
+import h5py
 import numpy as np
 import scipy.sparse as sp_sparse
 import torch
+from anndata._core.sparse_dataset import SparseDataset
 
 from scvi import REGISTRY_KEYS
 from scvi._types import Number
@@ -97,9 +99,9 @@ def scrna_raw_counts_properties(
 
     key = "_scvi_raw_norm_scaling"
     if key not in adata.obs.keys():
-        scaling_factor = 1 / np.asarray(data.sum(axis=1)).ravel().reshape(-1, 1)
-        scaling_factor *= 1e4
-        adata.obs[key] = scaling_factor.ravel()
+        scaling_factor = (1e4 / _get_sum_counts(data)).astype(np.float32)
+        adata.obs[key] = scaling_factor
+        scaling_factor = scaling_factor.reshape(-1, 1)
     else:
         scaling_factor = adata.obs[key].to_numpy().ravel().reshape(-1, 1)
 
@@ -250,31 +252,56 @@ def _init_library_size(
         should not be used in any downstream computation.
     """
     data = adata_manager.get_from_registry(REGISTRY_KEYS.X_KEY)
-    batch_indices = adata_manager.get_from_registry(REGISTRY_KEYS.BATCH_KEY)
-
-    library_log_means = np.zeros(n_batch)
-    library_log_vars = np.ones(n_batch)
-
-    for i_batch in np.unique(batch_indices):
-        idx_batch = np.squeeze(batch_indices == i_batch)
-        batch_data = data[
-            idx_batch.nonzero()[0]
-        ]  # h5ad requires integer indexing arrays.
-        sum_counts = batch_data.sum(axis=1)
-        masked_log_sum = np.ma.log(sum_counts)
-        if np.ma.is_masked(masked_log_sum):
-            warnings.warn(
-                "This dataset has some empty cells, this might fail inference."
-                "Data should be filtered with `scanpy.pp.filter_cells()`"
-            )
-
-        log_counts = masked_log_sum.filled(0)
-        library_log_means[i_batch] = np.mean(log_counts).astype(np.float32)
-        library_log_vars[i_batch] = np.var(log_counts).astype(np.float32)
+    batch_indices = adata_manager.get_from_registry(REGISTRY_KEYS.BATCH_KEY).ravel()
+
+    library_log_means = np.zeros(n_batch, dtype=np.float32)
+    library_log_vars = np.ones(n_batch, dtype=np.float32)
+
+    # single reduction over all cells, then aggregate per batch
+    sum_counts = _get_sum_counts(data)
+    empty_cells = sum_counts <= 0
+    if empty_cells.any():
+        warnings.warn(
+            "This dataset has some empty cells, this might fail inference."
+            "Data should be filtered with `scanpy.pp.filter_cells()`"
+        )
+    # empty cells get a log library size of 0, float64 keeps the moments below precise
+    log_counts = np.log(np.where(empty_cells, 1, sum_counts)).astype(np.float64)
+
+    order = np.argsort(batch_indices, kind="stable")
+    sorted_batches = batch_indices[order]
+    log_counts = log_counts[order]
+    present_batches = np.unique(sorted_batches)
+    boundaries = np.searchsorted(sorted_batches, present_batches)
+    n_cells = np.diff(np.append(boundaries, len(sorted_batches)))
+
+    # mean and variance from sums of x and x^2, cast to float32 on assignment
+    sums = np.add.reduceat(log_counts, boundaries)
+    sq_sums = np.add.reduceat(log_counts * log_counts, boundaries)
+    batch_means = sums / n_cells
+    batch_vars = np.maximum(sq_sums / n_cells - batch_means * batch_means, 0)
+    library_log_means[present_batches] = batch_means
+    library_log_vars[present_batches] = batch_vars
 
     return library_log_means.reshape(1, -1), library_log_vars.reshape(1, -1)
 
 
+def _get_sum_counts(
+    data: Union[np.ndarray, sp_sparse.spmatrix, h5py.Dataset, SparseDataset],
+    chunk_size: int = 10000,
+) -> np.ndarray:
+    """Returns the total counts of each cell as a 1-d ``np.ndarray``."""
+    if isinstance(data, h5py.Dataset) or isinstance(data, SparseDataset):
+        # for backed anndata, read in chunks of rows
+        return np.concatenate(
+            [
+                np.asarray(data[i : i + chunk_size].sum(axis=1)).ravel()
+                for i in range(0, data.shape[0], chunk_size)
+            ]
+        )
+    return np.asarray(data.sum(axis=1)).ravel()
+
+
 def _get_var_names_from_manager(
     adata_manager: AnnDataManager, registry_key: str = REGISTRY_KEYS.X_KEY
 ) -> np.ndarray:
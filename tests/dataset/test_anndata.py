@@ -1,3 +1,4 @@
+import itertools
 import os
 import random
 
@@ -497,3 +498,41 @@ def test_backed_anndata_sparse(adata, save_path):
     # test get item
     bd = AnnTorchDataset(adata_manager)
     bd[np.arange(adata.n_obs)]
+
+
+def test_check_nonnegative_integers():
+    from scvi.data._utils import _check_nonnegative_integers
+
+    x = np.random.randint(0, 10, size=(50, 20))
+    assert _check_nonnegative_integers(x)
+    assert _check_nonnegative_integers(csr_matrix(x))
+    assert _check_nonnegative_integers(x.astype(np.float32))
+    assert not _check_nonnegative_integers(-x - 1)
+    assert not _check_nonnegative_integers(x + 0.5)
+    assert _check_nonnegative_integers(csr_matrix((50, 20), dtype=np.float32))
+    assert not _check_nonnegative_integers(np.full((50, 20), np.inf))
+
+
+def test_get_batch_mask_protein_data():
+    from scvi.data._utils import _get_batch_mask_protein_data
+
+    adata = synthetic_iid()
+    # shuffle so cells of a batch are not contiguous
+    batches = np.random.permutation(adata.obs["batch"].to_numpy())
+    pro_exp = adata.obsm["protein_expression"]
+    pro_exp[batches == "batch_1", :50] = 0
+    # category order that does and does not match the lexical order of values
+    for categories, data in itertools.product(
+        [["batch_0", "batch_1"], ["batch_1", "batch_0"]],
+        [pro_exp, csr_matrix(pro_exp)],
+    ):
+        adata.obs["batch"] = pd.Categorical(batches, categories=categories)
+        adata.obsm["protein_expression"] = data
+        batch_mask = _get_batch_mask_protein_data(adata, "protein_expression", "batch")
+        assert set(batch_mask) == set(np.unique(batches))
+        for b in np.unique(batches):
+            batch_sum = data[np.where(batches == b)[0], :].sum(axis=0)
+            np.testing.assert_array_equal(
+                np.asarray(batch_mask[b]).ravel(), np.asarray(batch_sum != 0).ravel()
+            )
+        assert not np.asarray(batch_mask["batch_1"]).ravel()[:50].any()
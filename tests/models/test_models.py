@@ -775,6 +775,49 @@ def test_backed_anndata_scvi(save_path):
     model.get_elbo()
 
 
+def test_init_library_size(save_path):
+    from scvi.model._utils import _get_sum_counts, _init_library_size
+
+    adata = synthetic_iid()
+    # batch_1 is unused so its code is absent from the data
+    adata.obs["batch"] = pd.Categorical(
+        np.random.choice(["batch_0", "batch_2"], size=adata.n_obs),
+        categories=["batch_0", "batch_1", "batch_2"],
+    )
+    adata.X[0] = 0
+    n_batch = 4
+    codes = adata.obs["batch"].cat.codes.to_numpy()
+    sum_counts = adata.X.sum(axis=1)
+    log_counts = np.log(np.where(sum_counts > 0, sum_counts, 1))
+    expected_means = np.zeros(n_batch)
+    expected_vars = np.ones(n_batch)
+    for b in np.unique(codes):
+        expected_means[b] = np.mean(log_counts[codes == b])
+        expected_vars[b] = np.var(log_counts[codes == b])
+
+    for X in [adata.X, adata.X.astype(np.float32), csr_matrix(adata.X)]:
+        bdata = adata.copy()
+        bdata.X = X
+        adata_manager = generic_setup_adata_manager(bdata, batch_key="batch")
+        with pytest.warns(UserWarning, match="empty cells"):
+            means, variances = _init_library_size(adata_manager, n_batch)
+        assert means.shape == variances.shape == (1, n_batch)
+        np.testing.assert_allclose(means.ravel(), expected_means, rtol=1e-5)
+        np.testing.assert_allclose(variances.ravel(), expected_vars, rtol=1e-5)
+
+    # backed data is read in chunks of rows
+    for X in [adata.X, csr_matrix(adata.X)]:
+        bdata = adata.copy()
+        bdata.X = X
+        path = os.path.join(save_path, "test_library_size.h5ad")
+        bdata.write_h5ad(path)
+        bdata = anndata.read_h5ad(path, backed="r")
+        np.testing.assert_array_equal(
+            _get_sum_counts(bdata.X, chunk_size=7), sum_counts
+        )
+        bdata.file.close()
+
+
 def test_ann_dataloader():
     a = scvi.data.synthetic_iid()
     adata_manager = generic_setup_adata_manager(